@@ -1,17 +1,25 @@
 import os
 import sys
+import subprocess
 
 def start_system():
     print("🚀 System Starting...")
     
     
-    print("\n[1/2] Updating Tokens from Angel One...")
+    print("\n[1/3] Updating Tokens from Angel One...")
     os.system(f'"{sys.executable}" scripts/pipeline.py')
     
     
-    print("\n[2/2] Launching Trading Terminal...")
+    print("\n[2/3] Starting Shared Panel Writer...")
+    writer = subprocess.Popen([sys.executable, "scripts/panel_writer.py"])
     
-    os.system(f'"{sys.executable}" -m streamlit run ui/app.py')
+    
+    print("\n[3/3] Launching Trading Terminal...")
+    try:
+        os.system(f'"{sys.executable}" -m streamlit run ui/app.py')
+    finally:
+        writer.terminate()
+        writer.wait()
 
 if __name__ == "__main__":
-    start_system()
\ No newline at end of file
+    start_system()
@@ -0,0 +1,95 @@
+import sys
+import os
+import time
+import signal
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+from utils.data_loader import DataLoader, SessionExpired
+from features.feature_engineering import FeatureEngine
+from utils.shared_panel import SharedPanelWriter
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SYMBOLS_FILE = os.path.join(ROOT_DIR, "symbols.csv")
+SECRETS_FILE = os.path.join(ROOT_DIR, ".streamlit", "secrets.toml")
+INTERVALS = ["THREE_MINUTE", "FIVE_MINUTE", "TEN_MINUTE", "FIFTEEN_MINUTE"]
+
+# Angel One allows ~3 getCandleData calls/s; stay under it and back off on errors.
+REQUEST_SPACING = 0.35
+BACKOFF_SECONDS = 5
+
+
+def load_secrets():
+    # st.secrets resolves relative to the cwd; read the repo's file directly.
+    try:
+        import tomllib
+    except ImportError:
+        import toml  # ships with streamlit; Python 3.10 has no tomllib
+        return toml.load(SECRETS_FILE)
+    with open(SECRETS_FILE, "rb") as f:
+        return tomllib.load(f)
+
+
+def _heartbeat(writers):
+    for writer in writers.values():
+        writer.heartbeat()
+
+
+def run_writer():
+    print("🚀 Starting Shared Panel Writer...")
+    # docker stop / systemd send SIGTERM; route it through the finally below.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    df_symbols = pd.read_csv(SYMBOLS_FILE)
+    secrets = load_secrets()
+    api = None
+    writers = {}
+    try:
+        for token in df_symbols['token']:
+            for interval in INTERVALS:
+                writers[(token, interval)] = SharedPanelWriter(token, interval)
+        print(f"✅ Panels ready: {len(writers)} blocks")
+
+        while True:
+            cycle_start = time.monotonic()
+            for (token, interval), writer in writers.items():
+                time.sleep(REQUEST_SPACING)
+                _heartbeat(writers)
+                if api is None:
+                    # One login per session; only redone after an auth failure.
+                    api = DataLoader.login(secrets)
+                    if api is None:
+                        print("   ❌ Angel One login failed")
+                        time.sleep(BACKOFF_SECONDS)
+                        continue
+                try:
+                    df = DataLoader.fetch_candles(token, interval, api=api)
+                except SessionExpired as e:
+                    print(f"   🔑 {e}; logging in again")
+                    api = None
+                    continue
+                except Exception as e:
+                    print(f"   ⚠️  Fetch Error {token}/{interval}: {e}")
+                    time.sleep(BACKOFF_SECONDS)
+                    continue
+                if df.empty:
+                    print(f"   ⚠️  No candles for {token}/{interval}")
+                    continue
+                try:
+                    df = FeatureEngine.apply_indicators(df)
+                except Exception as e:
+                    print(f"   ⚠️  Indicator Error {token}/{interval}: {e}")
+                    continue
+                writer.publish(df)
+            print(f"🔄 Cycle done in {time.monotonic() - cycle_start:.1f}s")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for writer in writers.values():
+            writer.close()
+        print("🛑 Panels released")
+
+if __name__ == "__main__":
+    run_writer()
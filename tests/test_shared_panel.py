@@ -0,0 +1,210 @@
+import sys
+import os
+import gc
+import signal
+import subprocess
+import multiprocessing as mp
+from uuid import uuid4
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+import pytest
+from utils.shared_panel import COLUMNS, H_HEARTBEAT, H_PID, H_SEQ, SharedPanelReader, SharedPanelWriter
+
+
+def make_bars(start, periods, close_from=100.0):
+    index = pd.date_range(start, periods=periods, freq='5min', tz='+05:30', name='timestamp')
+    df = pd.DataFrame({c: 0.0 for c in COLUMNS}, index=index)
+    df['close'] = close_from + np.arange(periods, dtype=float)
+    df['scalp_buy'] = True
+    return df
+
+
+@pytest.fixture
+def token():
+    # macOS caps shm names at 31 characters.
+    return f"t{uuid4().hex[:6]}"
+
+
+@pytest.fixture
+def writer(token):
+    w = SharedPanelWriter(token, "FIVE_MINUTE", capacity=4)
+    yield w
+    w.close()
+
+
+def read_closes(token, interval, queue):
+    reader = SharedPanelReader.attach(token, interval)
+    version = reader.version
+    queue.put(list(reader.frame(copy=True)[1]['close']))
+    reader.wait_for_update(version, timeout=5.0)
+    queue.put(list(reader.frame(copy=True)[1]['close']))
+    reader.close()
+
+
+def test_publish_appends_and_rewrites_tail_bar(token, writer):
+    writer.publish(make_bars("2024-01-01 09:15", 2))
+    forming = make_bars("2024-01-01 09:20", 2, close_from=200.0)
+    assert writer.publish(forming) == 2
+
+    reader = SharedPanelReader.attach(token, "FIVE_MINUTE")
+    _, df = reader.frame(copy=True)
+    assert list(df['close']) == [100.0, 200.0, 201.0]
+    assert df['scalp_buy'].iloc[-1] == 1.0
+    assert writer.publish(make_bars("2024-01-01 09:00", 2)) == 0
+    reader.close()
+
+
+def test_frame_keeps_exchange_timezone(token, writer):
+    bars = make_bars("2024-01-01 09:15", 3)
+    writer.publish(bars)
+    reader = SharedPanelReader.attach(token, "FIVE_MINUTE")
+    _, df = reader.frame(copy=True)
+    assert str(df.index.tz) == str(bars.index.tz)
+    assert list(df.index) == list(bars.index)
+    reader.close()
+
+
+def test_frames_outlive_their_reader(token, writer):
+    writer.publish(make_bars("2024-01-01 09:15", 3))
+    _, dropped = SharedPanelReader.attach(token, "FIVE_MINUTE").frame()
+    reader = SharedPanelReader.attach(token, "FIVE_MINUTE")
+    _, closed = reader.frame()
+    reader.close()
+    del reader
+    gc.collect()
+    assert dropped['close'].tolist() == [100.0, 101.0, 102.0]
+    assert closed['close'].tolist() == [100.0, 101.0, 102.0]
+    with pytest.raises(ValueError):
+        closed.values[0, 0] = 1.0
+
+
+def test_snapshot_times_out_while_writer_is_mid_publish(token, writer):
+    writer.publish(make_bars("2024-01-01 09:15", 1))
+    reader = SharedPanelReader.attach(token, "FIVE_MINUTE")
+    writer.header[H_SEQ] += 1
+    try:
+        with pytest.raises(TimeoutError):
+            reader.frame(timeout=0.05)
+    finally:
+        writer.header[H_SEQ] += 1
+    assert reader.frame(timeout=0.05)[1]['close'].tolist() == [100.0]
+    reader.close()
+
+
+def test_age_tracks_last_successful_publish(token, writer):
+    reader = SharedPanelReader.attach(token, "FIVE_MINUTE")
+    assert reader.age == float('inf')
+    writer.publish(make_bars("2024-01-01 09:15", 1))
+    assert reader.age < 5
+    reader.close()
+
+
+def test_overflow_bumps_epoch_and_copies_stay_aligned(token, writer):
+    writer.publish(make_bars("2024-01-01 09:15", 4))
+    reader = SharedPanelReader.attach(token, "FIVE_MINUTE")
+    epoch, view = reader.frame()
+    _, held = reader.frame(copy=True)
+
+    writer.publish(make_bars("2024-01-01 09:30", 2, close_from=103.0))
+
+    assert reader.epoch != epoch
+    assert list(held['close']) == [100.0, 101.0, 102.0, 103.0]
+    _, fresh = reader.frame(copy=True)
+    assert list(fresh.index.strftime('%H:%M')) == ['09:20', '09:25', '09:30', '09:35']
+    assert list(fresh['close']) == [101.0, 102.0, 103.0, 104.0]
+    _, tail = reader.frame(tail=2, copy=True)
+    assert list(tail['close']) == [103.0, 104.0]
+    del view
+    reader.close()
+
+
+def test_reader_in_other_process_sees_new_bars(token, writer):
+    writer.publish(make_bars("2024-01-01 09:15", 2))
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=read_closes, args=(token, "FIVE_MINUTE", queue))
+    proc.start()
+    assert queue.get(timeout=30) == [100.0, 101.0]
+    writer.publish(make_bars("2024-01-01 09:25", 1, close_from=102.0))
+    assert queue.get(timeout=30) == [100.0, 101.0, 102.0]
+    proc.join(timeout=30)
+    assert proc.exitcode == 0
+
+    # The reader exiting must not take the writer's block with it.
+    reader = SharedPanelReader.attach(token, "FIVE_MINUTE")
+    assert reader is not None and reader.live
+    reader.close()
+
+
+def test_second_writer_is_refused_while_first_is_live(token, writer):
+    with pytest.raises(RuntimeError):
+        SharedPanelWriter(token, "FIVE_MINUTE", capacity=4)
+    with pytest.raises(RuntimeError):
+        SharedPanelWriter(token, "FIVE_MINUTE", capacity=8)
+
+    # A stalled writer (stale heartbeat, live PID) still owns the block.
+    writer.header[H_HEARTBEAT] = 0
+    with pytest.raises(RuntimeError):
+        SharedPanelWriter(token, "FIVE_MINUTE", capacity=4)
+
+
+def test_dead_or_silent_writer_is_not_live(token, writer):
+    writer.publish(make_bars("2024-01-01 09:15", 1))
+    reader = SharedPanelReader.attach(token, "FIVE_MINUTE")
+    assert reader.live
+
+    reader.stale_after = 0.0
+    assert not reader.live
+    reader.stale_after = 30.0
+
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    writer.header[H_PID] = dead.pid
+    assert not reader.live
+    reader.close()
+
+
+def test_killed_writer_is_not_live_and_can_be_replaced(token):
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    code = (
+        "import sys; sys.path.insert(0, %r)\n"
+        "from utils.shared_panel import SharedPanelWriter\n"
+        "w = SharedPanelWriter(%r, 'FIVE_MINUTE', capacity=4)\n"
+        "print('ready', flush=True); sys.stdin.readline()\n"
+    ) % (root, token)
+    proc = subprocess.Popen([sys.executable, "-c", code], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    assert proc.stdout.readline().strip() == "ready"
+    reader = SharedPanelReader.attach(token, "FIVE_MINUTE")
+    assert reader.live
+
+    proc.send_signal(signal.SIGKILL)
+    proc.wait()
+    assert not reader.live
+    reader.close()
+
+    # The block outlives the killed writer and is adopted by its replacement.
+    replacement = SharedPanelWriter(token, "FIVE_MINUTE", capacity=4)
+    try:
+        reader = SharedPanelReader.attach(token, "FIVE_MINUTE")
+        assert reader.live
+        reader.close()
+    finally:
+        replacement.close()
+
+
+def test_writer_restart_keeps_rows(token):
+    first = SharedPanelWriter(token, "FIVE_MINUTE", capacity=4)
+    first.publish(make_bars("2024-01-01 09:15", 2))
+    first.close(unlink=False)
+
+    second = SharedPanelWriter(token, "FIVE_MINUTE", capacity=4)
+    try:
+        second.publish(make_bars("2024-01-01 09:25", 1, close_from=102.0))
+        reader = SharedPanelReader.attach(token, "FIVE_MINUTE")
+        assert list(reader.frame(copy=True)[1]['close']) == [100.0, 101.0, 102.0]
+        reader.close()
+    finally:
+        second.close()
@@ -6,6 +6,7 @@ import sys
 import os
 import requests
 import time
+import threading
 
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -15,6 +16,7 @@ sys.path.append(root_dir)
 try:
     from utils.data_loader import DataLoader
     from features.feature_engineering import FeatureEngine
+    from utils.shared_panel import SharedPanelReader, BOOL_COLUMNS
 except ImportError as e:
     st.error(f"System Error: {e}")
     st.stop()
@@ -22,10 +24,38 @@ except ImportError as e:
 st.set_page_config(layout="wide", page_title="Pro Trader", page_icon="📈")
 
 
+# Panels older than fetch_ohlcv's cache TTL are no fresher than refetching.
+PANEL_MAX_AGE = 60
+
+
+@st.cache_resource(show_spinner=False)
+def panel_registry():
+    # Shared by every session. Readers are only ever dropped, never closed: a
+    # dropped reader stays mapped while any session still holds it or a frame.
+    return threading.Lock(), {}
+
+
+def get_panel(key):
+    lock, readers = panel_registry()
+    with lock:
+        if key not in readers:
+            reader = SharedPanelReader.attach(*key)
+            if reader is None: return None
+            readers[key] = reader
+        return readers[key]
+
+
+def release_panel(key):
+    lock, readers = panel_registry()
+    with lock:
+        readers.pop(key, None)
+
+
 with st.sidebar:
     st.title("⚡ Algo Controls")
     if st.button("🧹 Clear Cache (Fix Bugs)", use_container_width=True):
         st.cache_data.clear()
+        st.cache_resource.clear()
         st.rerun()
 
 
@@ -81,17 +111,36 @@ with st.sidebar:
 
 
 tf_map = {"3min": "THREE_MINUTE", "5min": "FIVE_MINUTE", "10min": "TEN_MINUTE", "15min": "FIFTEEN_MINUTE"}
-df = DataLoader.fetch_ohlcv(watchlist[asset], tf_map[interval])
+
+
+panel_key = (watchlist[asset], tf_map[interval])
+panel = get_panel(panel_key)
+if panel is not None and not panel.live:
+    release_panel(panel_key)
+    panel = None
+
+# scripts/panel_writer.py already keeps candles + indicators in shared memory.
+# Copy the rendered tail inside one seqlock round so later publishes can't shift it.
+df = pd.DataFrame()
+if panel is not None and panel.age <= PANEL_MAX_AGE:
+    try:
+        df = panel.frame(tail=100, copy=True)[1]
+    except TimeoutError:
+        pass
+if df.empty:
+    panel = None
+    df = DataLoader.fetch_ohlcv(watchlist[asset], tf_map[interval])
 
 if df.empty: st.warning("Data Loading..."); st.stop()
 
 
-try:
-    df = FeatureEngine.apply_indicators(df)
-except Exception as e:
-    
-    st.error(f"Indicator Error: {e}")
-    st.write("Hint: Make sure 'ta' is in requirements.txt")
+if panel is None:
+    try:
+        df = FeatureEngine.apply_indicators(df)
+    except Exception as e:
+        
+        st.error(f"Indicator Error: {e}")
+        st.write("Hint: Make sure 'ta' is in requirements.txt")
 
 last = df.iloc[-1]
 rsi = last['rsi']
@@ -116,7 +165,7 @@ st.markdown(f"""
 """, unsafe_allow_html=True)
 
 
-display_df = df.tail(100)
+display_df = df.tail(100).astype({c: bool for c in BOOL_COLUMNS if c in df.columns})
 row_heights = [0.55, 0.15, 0.15, 0.15] if show_macd else [0.7, 0.15, 0.15]
 
 fig = make_subplots(
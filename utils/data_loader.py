@@ -5,6 +5,14 @@ from SmartApi import SmartConnect
 import pyotp
 import time
 
+# Angel One errorcodes for an invalid, expired or missing session token.
+AUTH_ERROR_CODES = ("AG8001", "AG8002", "AG8003")
+
+
+class SessionExpired(RuntimeError):
+    pass
+
+
 class DataLoader:
     @staticmethod
     def get_session():
@@ -12,12 +20,20 @@ class DataLoader:
         if 'smart_api' in st.session_state and st.session_state['smart_api']:
             return st.session_state['smart_api']
 
+        obj = DataLoader.login(st.secrets)
+        if obj:
+            st.session_state['smart_api'] = obj
+        return obj
+
+    @staticmethod
+    def login(secrets):
+        # `secrets` is st.secrets or any dict loaded from secrets.toml.
         try:
             
-            api_key = st.secrets.get("TRADING_API_KEY") or st.secrets.get("API_KEY")
-            client_id = st.secrets.get("CLIENT_ID")
-            pwd = st.secrets.get("TRADING_PWD") or st.secrets.get("PASSWORD")
-            raw_totp = st.secrets.get("TOTP_KEY")
+            api_key = secrets.get("TRADING_API_KEY") or secrets.get("API_KEY")
+            client_id = secrets.get("CLIENT_ID")
+            pwd = secrets.get("TRADING_PWD") or secrets.get("PASSWORD")
+            raw_totp = secrets.get("TOTP_KEY")
             
             if not all([api_key, client_id, pwd, raw_totp]):
                 return None
@@ -28,39 +44,45 @@ class DataLoader:
             
             data = obj.generateSession(client_id, pwd, totp)
             
-            if data['status']:
-                st.session_state['smart_api'] = obj
-                return obj
-            else:
-                return None
+            return obj if data['status'] else None
         except Exception as e:
             return None
 
     @staticmethod
     @st.cache_data(ttl=60, show_spinner=False)
     def fetch_ohlcv(symbol_token, interval="FIVE_MINUTE"):
-        api = DataLoader.get_session()
-        if not api: return pd.DataFrame()
-        
-        to_date = datetime.now().strftime("%Y-%m-%d %H:%M")
-        from_date = (datetime.now() - timedelta(days=5)).strftime("%Y-%m-%d %H:%M")
-        
         try:
             time.sleep(0.1) 
-            data = api.getCandleData({
-                "exchange": "NSE", 
-                "symboltoken": str(symbol_token),
-                "interval": interval, 
-                "fromdate": from_date, 
-                "todate": to_date
-            })
-            
-            if data and isinstance(data, dict) and data.get('status'):
-                df = pd.DataFrame(data['data'], columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-                df.set_index('timestamp', inplace=True)
-                return df.astype(float)
-            else:
-                return pd.DataFrame()
+            return DataLoader.fetch_candles(symbol_token, interval)
         except Exception:
-            return pd.DataFrame()
\ No newline at end of file
+            return pd.DataFrame()
+
+    @staticmethod
+    def fetch_candles(symbol_token, interval="FIVE_MINUTE", days=5, api=None):
+        # Uncached; raises on API errors so long-running callers can log them.
+        # Callers outside `streamlit run` should pass their own `api` session.
+        api = api or DataLoader.get_session()
+        if not api: raise ConnectionError("No Angel One session")
+        
+        to_date = datetime.now().strftime("%Y-%m-%d %H:%M")
+        from_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d %H:%M")
+        
+        data = api.getCandleData({
+            "exchange": "NSE", 
+            "symboltoken": str(symbol_token),
+            "interval": interval, 
+            "fromdate": from_date, 
+            "todate": to_date
+        })
+        
+        if isinstance(data, dict) and data.get('errorcode') in AUTH_ERROR_CODES:
+            raise SessionExpired(f"getCandleData: {data.get('message')}")
+        if not (data and isinstance(data, dict) and data.get('status')):
+            msg = data.get('message') if isinstance(data, dict) else data
+            raise RuntimeError(f"getCandleData failed: {msg}")
+        if not data.get('data'):
+            return pd.DataFrame()
+        df = pd.DataFrame(data['data'], columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        df.set_index('timestamp', inplace=True)
+        return df.astype(float)
\ No newline at end of file
@@ -0,0 +1,325 @@
+import os
+import sys
+import mmap
+import time
+from datetime import timedelta, timezone
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory, resource_tracker
+
+# One shared block per (token, interval):
+#   header  int64[HEADER_SLOTS]
+#   ts      int64[capacity]           (UTC epoch nanoseconds)
+#   values  float64[capacity, n_cols] (row-major, one row per bar)
+#
+# The header's `seq` slot is a seqlock: the writer makes it odd before touching
+# the arrays and even again afterwards, so `seq` doubles as the panel version.
+# `epoch` is bumped whenever old rows are dropped to make room, which shifts
+# row positions and invalidates any zero-copy frame a reader was holding.
+# `pid` + `heartbeat` (time.monotonic_ns, shared by all processes on the host)
+# let readers tell a running writer from a dead one; `updated` is when this
+# block last received a successful fetch, so readers can spot stale data.
+# Blocks are kept away from multiprocessing's resource tracker, so a killed
+# writer leaves its block behind for the next writer to adopt.
+
+MAGIC = 0x54574149  # "TWAI"
+LAYOUT_VERSION = 3
+HEADER_SLOTS = 11
+(H_MAGIC, H_LAYOUT, H_SEQ, H_ROWS, H_CAPACITY, H_COLS, H_EPOCH,
+ H_PID, H_HEARTBEAT, H_UTC_OFFSET, H_UPDATED) = range(HEADER_SLOTS)
+
+COLUMNS = (
+    'open', 'high', 'low', 'close', 'volume',
+    'ema_9', 'ema_50', 'rsi', 'stoch_k', 'vwap',
+    'in_uptrend', 'supertrend',
+    'macd', 'macd_signal', 'macd_hist',
+    'bb_upper', 'bb_lower', 'psar',
+    'scalp_buy', 'scalp_sell',
+)
+BOOL_COLUMNS = ('in_uptrend', 'scalp_buy', 'scalp_sell')
+DEFAULT_CAPACITY = 4096
+STALE_AFTER = 30.0  # seconds without a heartbeat before a writer counts as dead
+NAIVE_TZ = np.iinfo(np.int64).min
+
+
+def block_name(token, interval):
+    return f"twai_{token}_{interval}".lower()
+
+
+def _layout(buf, capacity, n_cols):
+    header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=buf)
+    ts_off = HEADER_SLOTS * 8
+    ts = np.ndarray((capacity,), dtype=np.int64, buffer=buf, offset=ts_off)
+    val_off = ts_off + capacity * 8
+    values = np.ndarray((capacity, n_cols), dtype=np.float64, buffer=buf, offset=val_off)
+    return header, ts, values
+
+
+def _block_size(capacity, n_cols):
+    return (HEADER_SLOTS + capacity + capacity * n_cols) * 8
+
+
+def _pid_alive(pid):
+    if pid <= 0: return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _writer_alive(header, stale_after=STALE_AFTER):
+    if not _pid_alive(int(header[H_PID])): return False
+    age = time.monotonic_ns() - int(header[H_HEARTBEAT])
+    return age < stale_after * 1e9
+
+
+def _open(name, create=False, size=0):
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+    # Older Pythons always register with the resource tracker, which unlinks
+    # the block when *any* process that opened it exits.
+    shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def _map_readonly(name):
+    # Readers map the block themselves instead of using SharedMemory.buf:
+    # SharedMemory.close() (also run by its __del__) unmaps the block even
+    # while NumPy views of it exist. This mmap is never closed explicitly, and
+    # every array built on it holds a reference, so it lives as long as they do.
+    shm = _open(name)
+    try:
+        if os.name == 'nt':
+            return mmap.mmap(-1, shm.size, tagname=name, access=mmap.ACCESS_READ)
+        return mmap.mmap(shm._fd, shm.size, access=mmap.ACCESS_READ)
+    finally:
+        shm.close()
+
+
+def _unlink(shm):
+    if sys.version_info < (3, 13):
+        # unlink() unregisters again; give the tracker an entry to drop.
+        resource_tracker.register(shm._name, "shared_memory")
+    shm.unlink()
+
+
+class SharedPanelWriter:
+    """Owns the shared candle + feature block for one token/interval.
+
+    Only one writer may hold a block at a time; a second one raises
+    RuntimeError while the first is alive. Readers attach with SharedPanelReader.
+    """
+
+    def __init__(self, token, interval, capacity=DEFAULT_CAPACITY):
+        self.name = block_name(token, interval)
+        self.n_cols = len(COLUMNS)
+        size = _block_size(capacity, self.n_cols)
+        try:
+            self.shm = _open(self.name, create=True, size=size)
+            fresh = True
+        except FileExistsError:
+            self.shm = _open(self.name)
+            fresh = self._adopt(capacity)
+            if fresh:
+                _unlink(self.shm)
+                self.shm.close()
+                self.shm = _open(self.name, create=True, size=size)
+
+        self.capacity = capacity
+        self.header, self.ts, self.values = _layout(self.shm.buf, capacity, self.n_cols)
+        if fresh:
+            self.header[:] = 0
+            self.header[H_MAGIC] = MAGIC
+            self.header[H_LAYOUT] = LAYOUT_VERSION
+            self.header[H_CAPACITY] = capacity
+            self.header[H_COLS] = self.n_cols
+            self.header[H_UTC_OFFSET] = NAIVE_TZ
+        if self.header[H_SEQ] % 2:
+            # Previous writer died mid-update.
+            self.header[H_SEQ] += 1
+        self.header[H_PID] = os.getpid()
+        self.heartbeat()
+
+    def _adopt(self, capacity):
+        """Checks a block left behind by an earlier writer; True if it must be recreated."""
+        if self.shm.size < HEADER_SLOTS * 8:
+            return True
+        header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=self.shm.buf).copy()
+        if header[H_MAGIC] != MAGIC or header[H_LAYOUT] != LAYOUT_VERSION:
+            return True
+        if _pid_alive(int(header[H_PID])):
+            # Even with a stale heartbeat (stalled fetch, SIGSTOP) the owner may
+            # resume writing; two writers on one seqlock would corrupt the block.
+            self.shm.close()
+            raise RuntimeError(f"{self.name}: already owned by writer pid {header[H_PID]}")
+        return not (header[H_CAPACITY] == capacity and header[H_COLS] == self.n_cols)
+
+    @property
+    def version(self):
+        return int(self.header[H_SEQ])
+
+    def heartbeat(self):
+        self.header[H_HEARTBEAT] = time.monotonic_ns()
+
+    def publish(self, df):
+        """Append bars newer than the stored tail and refresh the tail bar itself.
+
+        `df` is the output of FeatureEngine.apply_indicators (timestamp index).
+        Returns the number of rows written.
+        """
+        self.heartbeat()
+        if df.empty: return 0
+        self.header[H_UPDATED] = time.monotonic_ns()
+
+        idx = pd.DatetimeIndex(df.index)
+        if idx.tz is not None:
+            offset = int(idx[-1].utcoffset().total_seconds())
+            idx = idx.tz_convert('UTC').tz_localize(None)
+        else:
+            offset = NAIVE_TZ
+        ts_new = idx.as_unit('ns').asi8
+        vals_new = df.reindex(columns=list(COLUMNS)).to_numpy(dtype=np.float64, na_value=np.nan)
+
+        n = int(self.header[H_ROWS])
+        if n:
+            keep = ts_new >= self.ts[n - 1]
+            ts_new, vals_new = ts_new[keep], vals_new[keep]
+            if not len(ts_new): return 0
+            start = n - 1 if ts_new[0] == self.ts[n - 1] else n
+        else:
+            start = 0
+
+        k = len(ts_new)
+        if k > self.capacity:
+            ts_new, vals_new = ts_new[-self.capacity:], vals_new[-self.capacity:]
+            k = self.capacity
+
+        self.header[H_SEQ] += 1
+        try:
+            overflow = start + k - self.capacity
+            if overflow > 0:
+                shift = min(overflow, start)
+                self.ts[:start - shift] = self.ts[shift:start]
+                self.values[:start - shift] = self.values[shift:start]
+                start -= shift
+                self.header[H_EPOCH] += 1
+            self.ts[start:start + k] = ts_new
+            self.values[start:start + k] = vals_new
+            self.header[H_ROWS] = start + k
+            self.header[H_UTC_OFFSET] = offset
+        finally:
+            self.header[H_SEQ] += 1
+        return k
+
+    def close(self, unlink=True):
+        self.header[H_PID] = 0
+        del self.header, self.ts, self.values
+        self.shm.close()
+        if unlink:
+            _unlink(self.shm)
+
+
+class SharedPanelReader:
+    """Read-only, zero-copy view onto a block maintained by SharedPanelWriter.
+
+    Arrays and frames handed out keep the mapping alive on their own, so they
+    stay safe to use after the reader is closed or garbage-collected.
+    """
+
+    def __init__(self, name, stale_after=STALE_AFTER):
+        self.name = name
+        self.stale_after = stale_after
+        mm = _map_readonly(name)
+        header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=mm).copy()
+        if header[H_MAGIC] != MAGIC or header[H_LAYOUT] != LAYOUT_VERSION:
+            raise ValueError(f"{name}: unknown panel layout")
+        if header[H_COLS] != len(COLUMNS):
+            raise ValueError(f"{name}: column count {header[H_COLS]} != {len(COLUMNS)}")
+        self.capacity = int(header[H_CAPACITY])
+        self.header, self.ts, self.values = _layout(mm, self.capacity, len(COLUMNS))
+
+    @staticmethod
+    def attach(token, interval):
+        """Returns a reader, or None if no writer has published this panel."""
+        try:
+            return SharedPanelReader(block_name(token, interval))
+        except (FileNotFoundError, ValueError):
+            return None
+
+    @property
+    def version(self):
+        return int(self.header[H_SEQ])
+
+    @property
+    def epoch(self):
+        return int(self.header[H_EPOCH])
+
+    @property
+    def live(self):
+        """False once the writer exits, is killed, or stops heartbeating."""
+        return _writer_alive(self.header, self.stale_after)
+
+    @property
+    def age(self):
+        """Seconds since this block last got fresh candles (inf if never)."""
+        updated = int(self.header[H_UPDATED])
+        if not updated: return float('inf')
+        return (time.monotonic_ns() - updated) / 1e9
+
+    def snapshot(self, tail=None, copy=False, timeout=0.5, poll=0.001):
+        """Consistent (version, epoch, ts, values) for the populated rows.
+
+        With copy=False these are views: rows before the last one stay valid
+        until `epoch` changes, and the last (forming) bar may be rewritten by
+        the next publish. With copy=True the arrays are private copies taken
+        inside one seqlock round and never change afterwards. Raises
+        TimeoutError if the writer stays mid-publish for `timeout` seconds.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            seq = self.header[H_SEQ]
+            if seq % 2 == 0:
+                n = int(self.header[H_ROWS])
+                epoch = int(self.header[H_EPOCH])
+                lo = 0 if tail is None else max(n - tail, 0)
+                ts, values = self.ts[lo:n], self.values[lo:n]
+                if copy:
+                    ts, values = ts.copy(), values.copy()
+                if self.header[H_SEQ] == seq:
+                    return int(seq), epoch, ts, values
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"{self.name}: writer held the panel for too long")
+            time.sleep(poll)
+
+    def frame(self, tail=None, copy=False, timeout=0.5):
+        """(epoch, DataFrame) over the last `tail` rows (all rows by default).
+
+        copy=False keeps the values in shared memory; compare the returned
+        epoch against `self.epoch` before trusting the frame again, since row
+        positions shift once the block is full. copy=True is always safe.
+        BOOL_COLUMNS come back as 0.0/1.0; cast the slice you actually use.
+        """
+        _, epoch, ts, values = self.snapshot(tail=tail, copy=copy, timeout=timeout)
+        index = pd.DatetimeIndex(ts.view('datetime64[ns]'), name='timestamp')
+        offset = int(self.header[H_UTC_OFFSET])
+        if offset != NAIVE_TZ:
+            index = index.tz_localize('UTC').tz_convert(timezone(timedelta(seconds=offset)))
+        return epoch, pd.DataFrame(values, index=index, columns=list(COLUMNS), copy=False)
+
+    def wait_for_update(self, version, timeout=1.0, poll=0.001):
+        """Blocks until the panel version moves past `version`; returns the new version."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            seq = int(self.header[H_SEQ])
+            if seq != version and seq % 2 == 0:
+                return seq
+            time.sleep(poll)
+        return int(self.header[H_SEQ])
+
+    def close(self):
+        """Drops this reader's references; the mapping goes once no frame uses it."""
+        self.header = self.ts = self.values = None